@@ -0,0 +1,14 @@
+# cython: language_level=3, boundscheck=False, wraparound=False
+"""
+Compiled pixel -> ASCII kernel for the terminal video player
+Built on first import through pyximport (see player.py)
+"""
+
+
+def apply_lut(const unsigned char[:, ::1] gray, const unsigned char[::1] lut, unsigned char[:, ::1] out):
+    """Write lut[gray] into the first columns of out (newline column is left as is)"""
+    cdef Py_ssize_t height = gray.shape[0], width = gray.shape[1]
+    cdef Py_ssize_t i, j
+    for i in range(height):
+        for j in range(width):
+            out[i, j] = lut[gray[i, j]]
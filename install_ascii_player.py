@@ -28,15 +28,49 @@ import numpy as np
 import sys
 import time
 import os
+import ctypes
+import queue
+from threading import Thread, Event
 import argparse
 
+try:
+    from numba import njit, prange
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
+try:
+    import pyximport
+    pyximport.install(language_level=3)
+    from _ascii import apply_lut
+    HAS_CYTHON = True
+except ImportError:
+    HAS_CYTHON = False
+
 ASCII_CHARS = '@%#*+=-:. '
 
+INTERPOLATIONS = {
+    'nearest': cv2.INTER_NEAREST,
+    'area': cv2.INTER_AREA,
+    'linear': cv2.INTER_LINEAR,
+}
+
+if HAS_NUMBA:
+    def make_renderer(height, width):
+        @njit(parallel=True, cache=True)
+        def render(gray, char_lut, out):
+            for i in prange(height):
+                for j in range(width):
+                    out[i, j] = char_lut[gray[i, j]]
+        
+        return render
+
 class ASCIIVideoPlayer:
-    def __init__(self, video_path, width=120, detailed=False):
+    def __init__(self, video_path, width=120, detailed=False, interpolation='nearest', cuda=False):
         self.video_path = video_path
         self.width = width
         self.detailed = detailed
+        self.interpolation = INTERPOLATIONS[interpolation]
         
         if detailed:
             self.ascii_chars = '$@B%8&WM#*oahkbdpqwmZO0QLCJUYXzcvunxrjft/\\\\|()1{}[]?-_+~<>i!lI;:,"^`\\'. '
@@ -53,69 +87,202 @@ class ASCIIVideoPlayer:
         self.original_height = int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
         self.height = int(self.width * self.original_height / self.original_width * 0.55)
         
+        self.cuda = cuda
+        self.cuda_error = None
+        self.use_cuda = (cuda and self.original_width * self.original_height >= 1920 * 1080
+                         and hasattr(cv2, 'cuda') and cv2.cuda.getCudaEnabledDeviceCount() > 0)
+        if self.use_cuda:
+            self._gpu_frame = cv2.cuda_GpuMat()
+        
+        self.frames = queue.Queue(maxsize=4)
+        self.stop_decoding = Event()
+        self.decoder = None
+        self.resume_frame = 0
+        self.decode_error = None
+        
+        self._frame_bufs = [
+            np.empty((self.original_height, self.original_width, 3), dtype=np.uint8)
+            for _ in range(self.frames.maxsize + 2)
+        ]
+        
+        ramp = np.frombuffer(self.ascii_chars.encode('ascii'), dtype=np.uint8)
+        self.char_lut = ramp[np.arange(256) * (len(ramp) - 1) // 255]
+        
+        self.out2d = np.empty((self.height, self.width + 1), dtype=np.uint8)
+        self.out2d[:, self.width] = ord('\\n')
+        
+        if HAS_NUMBA and not HAS_CYTHON:
+            self._kernel = make_renderer(self.height, self.width)
+            self._kernel(np.zeros((self.height, self.width), dtype=np.uint8), self.char_lut, self.out2d)
+        
+        self._prev = np.zeros_like(self.out2d)
+        
+        self._stdout = sys.stdout.buffer
+        
+        self._status_prefix = b'\\x1b[%d;1HFrame: ' % (self.height + 2)
+        self._status_mid = f"/{self.frame_count} | ".encode('ascii')
+        
+    def _gray_cuda(self, frame):
+        self._gpu_frame.upload(frame)
+        gray = cv2.cuda.cvtColor(self._gpu_frame, cv2.COLOR_BGR2GRAY)
+        gray = cv2.cuda.resize(gray, (self.width, self.height), interpolation=self.interpolation)
+        return gray.download()
+    
+    def _render(self, frame):
+        if frame.ndim == 2:
+            gray = frame
+        else:
+            gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+            gray = cv2.resize(gray, (self.width, self.height), interpolation=self.interpolation)
+        
+        if HAS_CYTHON:
+            apply_lut(gray, self.char_lut, self.out2d)
+        elif HAS_NUMBA:
+            self._kernel(gray, self.char_lut, self.out2d)
+        else:
+            cv2.LUT(gray, self.char_lut, dst=self.out2d[:, :self.width])
+    
     def frame_to_ascii(self, frame):
-        frame = cv2.resize(frame, (self.width, self.height))
-        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        self._render(frame)
+        return self.out2d.tobytes()
+    
+    def frame_update(self):
+        changed = np.flatnonzero(np.any(self.out2d != self._prev, axis=1))
         
-        ascii_frame = ''
-        for row in gray:
-            for pixel in row:
-                char_index = int(pixel / 255 * (len(self.ascii_chars) - 1))
-                ascii_frame += self.ascii_chars[char_index]
-            ascii_frame += '\\n'
+        update = bytearray()
+        for i in changed:
+            update += b'\\x1b[%d;1H' % (i + 1)
+            update += self.out2d[i, :self.width].tobytes()
         
-        return ascii_frame
+        self._prev[:] = self.out2d
+        return update
     
     def clear_screen(self):
-        os.system('cls' if os.name == 'nt' else 'clear')
+        sys.stdout.flush()
+        self._stdout.write(b'\\x1b[2J\\x1b[H')
+        self._stdout.flush()
+    
+    def _decode(self, frame_num):
+        try:
+            decoded = 0
+            while not self.stop_decoding.is_set():
+                if not self.cap.grab():
+                    break
+                
+                if frame_num < self.resume_frame:
+                    frame_num += 1
+                    continue
+                
+                frame_buf = self._frame_bufs[decoded % len(self._frame_bufs)]
+                ret, frame = self.cap.retrieve(frame_buf)
+                if not ret:
+                    break
+                if self.use_cuda:
+                    try:
+                        frame = self._gray_cuda(frame)
+                    except cv2.error as e:
+                        self.cuda_error = e
+                        self.use_cuda = False
+                self.frames.put((frame_num, frame))
+                frame_num += 1
+                decoded += 1
+        except Exception as e:
+            self.decode_error = e
+        finally:
+            self.frames.put(None)
     
     def play(self, start_frame=0):
         try:
             if start_frame > 0:
                 self.cap.set(cv2.CAP_PROP_POS_FRAMES, start_frame)
             
-            frame_delay = 1.0 / self.fps if self.fps > 0 else 0.033
-            frame_num = start_frame
+            self.decoder = Thread(target=self._decode, args=(start_frame,), daemon=True)
+            self.decoder.start()
+            
+            frame_delay_ns = int(1e9 / self.fps) if self.fps > 0 else 33_000_000
             
             print(f"\\nPlaying: {os.path.basename(self.video_path)}")
             print(f"Resolution: {self.original_width}x{self.original_height} -> {self.width}x{self.height} (ASCII)")
             print(f"FPS: {self.fps:.2f} | Frames: {self.frame_count}")
+            if self.cuda and not self.use_cuda:
+                print("CUDA: not used (needs OpenCV built with CUDA and a 1080p+ video), using CPU")
             print(f"\\nPress Ctrl+C to stop\\n")
             time.sleep(2)
             
             self.clear_screen()
             
+            anchor_ns, anchor_frame = time.monotonic_ns(), start_frame
+            resyncing = False
+            
             while True:
-                start_time = time.time()
-                
-                ret, frame = self.cap.read()
-                if not ret:
+                item = self.frames.get()
+                if item is None:
                     break
+                frame_num, frame = item
+                deadline = anchor_ns + (frame_num - anchor_frame + 1) * frame_delay_ns
                 
-                ascii_frame = self.frame_to_ascii(frame)
+                if frame_num < self.resume_frame:
+                    continue
                 
-                print(f"\\033[H", end='')
-                print(ascii_frame, end='')
-                print(f"\\nFrame: {frame_num}/{self.frame_count} | {frame_num/self.frame_count*100:.1f}%", end='')
+                now = time.monotonic_ns()
+                if now - deadline > frame_delay_ns:
+                    if not resyncing:
+                        self.resume_frame = anchor_frame + (now - anchor_ns) // frame_delay_ns
+                        resyncing = True
+                        continue
+                    
+                    anchor_ns, anchor_frame = now, frame_num
+                    deadline = now + frame_delay_ns
+                resyncing = False
                 
-                frame_num += 1
+                self._render(frame)
+                
+                update = self.frame_update()
+                percent = divmod(frame_num * 1000 // self.frame_count, 10)
+                update += self._status_prefix + b'%d' % frame_num + self._status_mid + b'%d.%d%%' % percent
+                self._stdout.write(update)
+                self._stdout.flush()
                 
-                elapsed = time.time() - start_time
-                sleep_time = frame_delay - elapsed
+                sleep_time = (deadline - time.monotonic_ns()) / 1e9
                 if sleep_time > 0:
                     time.sleep(sleep_time)
             
+            if self.decode_error is not None:
+                raise self.decode_error
+            
             print("\\n\\n[DONE] Video playback complete!")
             
         except KeyboardInterrupt:
             print("\\n\\n[STOP] Playback stopped by user")
         finally:
             self.cleanup()
+            if self.cuda_error is not None:
+                print(f"CUDA: failed ({self.cuda_error}), frames were converted on the CPU")
     
     def cleanup(self):
+        if self.decoder is not None:
+            self.stop_decoding.set()
+            while self.decoder.is_alive():
+                try:
+                    self.frames.get_nowait()
+                except queue.Empty:
+                    pass
+                self.decoder.join(timeout=0.05)
+        
         self.cap.release()
 
 
+def enable_ansi():
+    if os.name != 'nt':
+        return
+    
+    kernel32 = ctypes.windll.kernel32
+    handle = kernel32.GetStdHandle(-11)  # STD_OUTPUT_HANDLE
+    mode = ctypes.c_uint32()
+    if kernel32.GetConsoleMode(handle, ctypes.byref(mode)):
+        kernel32.SetConsoleMode(handle, mode.value | 0x0004)  # ENABLE_VIRTUAL_TERMINAL_PROCESSING
+
+
 def main():
     parser = argparse.ArgumentParser(
         description='Play videos in terminal as ASCII art',
@@ -136,6 +303,12 @@ Examples:
                         help='Use detailed ASCII character set')
     parser.add_argument('-s', '--start', type=int, default=0,
                         help='Start from frame number (default: 0)')
+    parser.add_argument('-i', '--interp', choices=sorted(INTERPOLATIONS), default='nearest',
+                        help='Resize interpolation (default: nearest, area is smoother)')
+    parser.add_argument('--cuda', action='store_true',
+                        help='Convert 1080p+ frames on the GPU (needs OpenCV built with CUDA)')
+    parser.add_argument('-t', '--threads', type=int, default=os.environ.get('ASCII_CV_THREADS', '2'),
+                        help='OpenCV worker threads (default: $ASCII_CV_THREADS or 2)')
     
     args = parser.parse_args()
     
@@ -143,8 +316,13 @@ Examples:
         print(f"Error: File not found: {args.video}")
         sys.exit(1)
     
+    cv2.setNumThreads(args.threads)
+    
+    enable_ansi()
+    
     try:
-        player = ASCIIVideoPlayer(args.video, width=args.width, detailed=args.detailed)
+        player = ASCIIVideoPlayer(args.video, width=args.width, detailed=args.detailed,
+                                  interpolation=args.interp, cuda=args.cuda)
         player.play(start_frame=args.start)
     except Exception as e:
         print(f"Error: {e}")
@@ -155,6 +333,17 @@ if __name__ == '__main__':
     main()
 '''
 
+# Optional compiled kernel, built by pyximport when Cython is available
+KERNEL_CODE = '''# cython: language_level=3, boundscheck=False, wraparound=False
+
+def apply_lut(const unsigned char[:, ::1] gray, const unsigned char[::1] lut, unsigned char[:, ::1] out):
+    cdef Py_ssize_t height = gray.shape[0], width = gray.shape[1]
+    cdef Py_ssize_t i, j
+    for i in range(height):
+        for j in range(width):
+            out[i, j] = lut[gray[i, j]]
+'''
+
 def print_header():
     print("=" * 60)
     print("  ASCII VIDEO PLAYER - INSTALLER")
@@ -164,8 +353,8 @@ def print_header():
 def check_python():
     """Check Python version"""
     print("[*] Checking Python version...")
-    if sys.version_info < (3, 6):
-        print("[X] Python 3.6 or higher is required")
+    if sys.version_info < (3, 7):
+        print("[X] Python 3.7 or higher is required")
         sys.exit(1)
     print(f"[OK] Python {sys.version.split()[0]} detected")
     print()
@@ -209,6 +398,10 @@ def create_application(install_dir, bin_dir):
     with open(player_file, 'w', encoding='utf-8') as f:
         f.write(PLAYER_CODE)
     
+    # Write the compiled kernel source next to it
+    with open(install_dir / "_ascii.pyx", 'w', encoding='utf-8') as f:
+        f.write(KERNEL_CODE)
+    
     # Make it executable (Unix-like systems)
     try:
         os.chmod(player_file, 0o755)
@@ -10,18 +10,55 @@ import numpy as np
 import sys
 import time
 import os
-from threading import Thread
+import ctypes
+import queue
+from threading import Thread, Event
 import argparse
 
+try:
+    from numba import njit, prange
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
+# Optional compiled kernel, built from _ascii.pyx on first use
+try:
+    import pyximport
+    pyximport.install(language_level=3)
+    from _ascii import apply_lut
+    HAS_CYTHON = True
+except ImportError:
+    HAS_CYTHON = False
+
 # ASCII characters from darkest to lightest
 ASCII_CHARS = '@%#*+=-:. '
 # Alternative detailed set: ASCII_CHARS = '$@B%8&WM#*oahkbdpqwmZO0QLCJUYXzcvunxrjft/\\|()1{}[]?-_+~<>i!lI;:,"^`\'. '
 
+# Resize interpolation modes; nearest is fastest and indistinguishable after quantization
+INTERPOLATIONS = {
+    'nearest': cv2.INTER_NEAREST,
+    'area': cv2.INTER_AREA,
+    'linear': cv2.INTER_LINEAR,
+}
+
+if HAS_NUMBA:
+    def make_renderer(height, width):
+        """Compile a renderer with the frame shape baked in as constants"""
+        @njit(parallel=True, cache=True)
+        def render(gray, char_lut, out):
+            """Write ASCII bytes for a grayscale frame into out (newline column is left as is)"""
+            for i in prange(height):
+                for j in range(width):
+                    out[i, j] = char_lut[gray[i, j]]
+        
+        return render
+
 class ASCIIVideoPlayer:
-    def __init__(self, video_path, width=120, detailed=False):
+    def __init__(self, video_path, width=120, detailed=False, interpolation='nearest', cuda=False):
         self.video_path = video_path
         self.width = width
         self.detailed = detailed
+        self.interpolation = INTERPOLATIONS[interpolation]
         
         if detailed:
             self.ascii_chars = '$@B%8&WM#*oahkbdpqwmZO0QLCJUYXzcvunxrjft/\\|()1{}[]?-_+~<>i!lI;:,"^`\'. '
@@ -42,28 +79,137 @@ class ASCIIVideoPlayer:
         # Calculate height to maintain aspect ratio
         self.height = int(self.width * self.original_height / self.original_width * 0.55)
         
-    def frame_to_ascii(self, frame):
-        """Convert a video frame to ASCII art"""
-        # Resize frame
-        frame = cv2.resize(frame, (self.width, self.height))
+        # Grayscale + resize on the GPU, only worth it for 1080p-class and larger sources
+        self.cuda = cuda
+        self.cuda_error = None
+        self.use_cuda = (cuda and self.original_width * self.original_height >= 1920 * 1080
+                         and hasattr(cv2, 'cuda') and cv2.cuda.getCudaEnabledDeviceCount() > 0)
+        if self.use_cuda:
+            self._gpu_frame = cv2.cuda_GpuMat()
+        
+        # Decoded frames are handed from the decoder thread to the renderer
+        self.frames = queue.Queue(maxsize=4)
+        self.stop_decoding = Event()
+        self.decoder = None
+        self.resume_frame = 0
+        self.decode_error = None
+        
+        # Preallocated decode buffers, reused round-robin. One more than the
+        # queue holds for the frame being rendered and one for the frame being
+        # decoded, so a buffer is never overwritten while still in use
+        self._frame_bufs = [
+            np.empty((self.original_height, self.original_width, 3), dtype=np.uint8)
+            for _ in range(self.frames.maxsize + 2)
+        ]
+        
+        # Lookup table mapping pixel value (0-255) directly to an ASCII byte
+        ramp = np.frombuffer(self.ascii_chars.encode('ascii'), dtype=np.uint8)
+        self.char_lut = ramp[np.arange(256) * (len(ramp) - 1) // 255]
+        
+        # Output buffer reused for every frame: one row per line, last column is '\n'
+        self.out2d = np.empty((self.height, self.width + 1), dtype=np.uint8)
+        self.out2d[:, self.width] = ord('\n')
+        
+        # Numba renderer specialized for this video's output size, compiled
+        # now so the first frame isn't late
+        if HAS_NUMBA and not HAS_CYTHON:
+            self._kernel = make_renderer(self.height, self.width)
+            self._kernel(np.zeros((self.height, self.width), dtype=np.uint8), self.char_lut, self.out2d)
+        
+        # Last frame shown on screen, so only changed rows are redrawn
+        self._prev = np.zeros_like(self.out2d)
         
-        # Convert to grayscale
-        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        # Frames are written straight to the binary stdout, one write per frame
+        self._stdout = sys.stdout.buffer
+        
+        # Constant parts of the status line below the frame
+        self._status_prefix = b'\x1b[%d;1HFrame: ' % (self.height + 2)
+        self._status_mid = f"/{self.frame_count} | ".encode('ascii')
+        
+    def _gray_cuda(self, frame):
+        """Convert and resize a frame on the GPU (runs in the decoder thread)"""
+        self._gpu_frame.upload(frame)
+        gray = cv2.cuda.cvtColor(self._gpu_frame, cv2.COLOR_BGR2GRAY)
+        gray = cv2.cuda.resize(gray, (self.width, self.height), interpolation=self.interpolation)
+        return gray.download()
+    
+    def _render(self, frame):
+        """Render a video frame into the output buffer"""
+        if frame.ndim == 2:
+            # Already converted on the GPU by the decoder
+            gray = frame
+        else:
+            # Convert to grayscale first so the resize only touches one channel
+            gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+            
+            # Resize frame
+            gray = cv2.resize(gray, (self.width, self.height), interpolation=self.interpolation)
         
         # Map pixel values to ASCII characters
-        ascii_frame = ''
-        for row in gray:
-            for pixel in row:
-                # Map 0-255 to ASCII character index
-                char_index = int(pixel / 255 * (len(self.ascii_chars) - 1))
-                ascii_frame += self.ascii_chars[char_index]
-            ascii_frame += '\n'
-        
-        return ascii_frame
+        if HAS_CYTHON:
+            apply_lut(gray, self.char_lut, self.out2d)
+        elif HAS_NUMBA:
+            self._kernel(gray, self.char_lut, self.out2d)
+        else:
+            # Gather straight into the output buffer, no temporary array
+            cv2.LUT(gray, self.char_lut, dst=self.out2d[:, :self.width])
+    
+    def frame_to_ascii(self, frame):
+        """Convert a video frame to ASCII art (as bytes)"""
+        self._render(frame)
+        return self.out2d.tobytes()
+    
+    def frame_update(self):
+        """Terminal output redrawing only the rows changed since the last frame"""
+        changed = np.flatnonzero(np.any(self.out2d != self._prev, axis=1))
+        
+        update = bytearray()
+        for i in changed:
+            update += b'\x1b[%d;1H' % (i + 1)
+            update += self.out2d[i, :self.width].tobytes()
+        
+        self._prev[:] = self.out2d
+        return update
     
     def clear_screen(self):
         """Clear terminal screen"""
-        os.system('cls' if os.name == 'nt' else 'clear')
+        sys.stdout.flush()
+        self._stdout.write(b'\x1b[2J\x1b[H')
+        self._stdout.flush()
+    
+    def _decode(self, frame_num):
+        """Decode frames into the queue (runs in a background thread)"""
+        try:
+            decoded = 0
+            while not self.stop_decoding.is_set():
+                if not self.cap.grab():
+                    break
+                
+                # Frames the player is too late for are only demuxed, not converted
+                if frame_num < self.resume_frame:
+                    frame_num += 1
+                    continue
+                
+                frame_buf = self._frame_bufs[decoded % len(self._frame_bufs)]
+                ret, frame = self.cap.retrieve(frame_buf)
+                if not ret:
+                    break
+                if self.use_cuda:
+                    try:
+                        frame = self._gray_cuda(frame)
+                    except cv2.error as e:
+                        # Carry on with the CPU path, reported once playback ends
+                        self.cuda_error = e
+                        self.use_cuda = False
+                self.frames.put((frame_num, frame))
+                frame_num += 1
+                decoded += 1
+        except Exception as e:
+            # Re-raised by play() on the main thread
+            self.decode_error = e
+        finally:
+            # Signal end of video
+            self.frames.put(None)
     
     def play(self, start_frame=0):
         """Play the video"""
@@ -72,53 +218,108 @@ class ASCIIVideoPlayer:
             if start_frame > 0:
                 self.cap.set(cv2.CAP_PROP_POS_FRAMES, start_frame)
             
-            frame_delay = 1.0 / self.fps if self.fps > 0 else 0.033
-            frame_num = start_frame
+            # Start decoding in the background so it overlaps with rendering
+            self.decoder = Thread(target=self._decode, args=(start_frame,), daemon=True)
+            self.decoder.start()
+            
+            frame_delay_ns = int(1e9 / self.fps) if self.fps > 0 else 33_000_000
             
             print(f"\nPlaying: {os.path.basename(self.video_path)}")
             print(f"Resolution: {self.original_width}x{self.original_height} -> {self.width}x{self.height} (ASCII)")
             print(f"FPS: {self.fps:.2f} | Frames: {self.frame_count}")
+            if self.cuda and not self.use_cuda:
+                print("CUDA: not used (needs OpenCV built with CUDA and a 1080p+ video), using CPU")
             print(f"\nPress Ctrl+C to stop\n")
             time.sleep(2)
             
             self.clear_screen()
             
+            # Absolute schedule, so conversion jitter doesn't accumulate as drift.
+            # It is re-anchored on the first frame shown after a skip
+            anchor_ns, anchor_frame = time.monotonic_ns(), start_frame
+            resyncing = False
+            
             while True:
-                start_time = time.time()
-                
-                # Read frame
-                ret, frame = self.cap.read()
-                if not ret:
+                # Get next decoded frame
+                item = self.frames.get()
+                if item is None:
                     break
+                frame_num, frame = item
+                deadline = anchor_ns + (frame_num - anchor_frame + 1) * frame_delay_ns
                 
-                # Convert to ASCII
-                ascii_frame = self.frame_to_ascii(frame)
+                # Drop frames queued before we fell behind
+                if frame_num < self.resume_frame:
+                    continue
                 
-                # Display
-                print(f"\033[H", end='')  # Move cursor to top
-                print(ascii_frame, end='')
-                print(f"\nFrame: {frame_num}/{self.frame_count} | {frame_num/self.frame_count*100:.1f}%", end='')
+                now = time.monotonic_ns()
+                if now - deadline > frame_delay_ns:
+                    if not resyncing:
+                        # More than a frame behind schedule: drop this frame and have
+                        # the decoder skip ahead to the frame that is due now
+                        self.resume_frame = anchor_frame + (now - anchor_ns) // frame_delay_ns
+                        resyncing = True
+                        continue
+                    
+                    # First frame reached after a skip: show it even if late, so
+                    # playback always progresses when decoding is slower than real time
+                    anchor_ns, anchor_frame = now, frame_num
+                    deadline = now + frame_delay_ns
+                resyncing = False
                 
-                frame_num += 1
+                # Convert to ASCII
+                self._render(frame)
+                
+                # Display changed rows and the status line in a single write
+                update = self.frame_update()
+                percent = divmod(frame_num * 1000 // self.frame_count, 10)
+                update += self._status_prefix + b'%d' % frame_num + self._status_mid + b'%d.%d%%' % percent
+                self._stdout.write(update)
+                self._stdout.flush()
                 
                 # Maintain frame rate
-                elapsed = time.time() - start_time
-                sleep_time = frame_delay - elapsed
+                sleep_time = (deadline - time.monotonic_ns()) / 1e9
                 if sleep_time > 0:
                     time.sleep(sleep_time)
             
+            if self.decode_error is not None:
+                raise self.decode_error
+            
             print("\n\n✓ Video playback complete!")
             
         except KeyboardInterrupt:
             print("\n\n⏸ Playback stopped by user")
         finally:
             self.cleanup()
+            if self.cuda_error is not None:
+                print(f"CUDA: failed ({self.cuda_error}), frames were converted on the CPU")
     
     def cleanup(self):
         """Release resources"""
+        if self.decoder is not None:
+            # Stop the decoder, draining the queue in case it is blocked on put()
+            self.stop_decoding.set()
+            while self.decoder.is_alive():
+                try:
+                    self.frames.get_nowait()
+                except queue.Empty:
+                    pass
+                self.decoder.join(timeout=0.05)
+        
         self.cap.release()
 
 
+def enable_ansi():
+    """Let the Windows console interpret ANSI escape sequences"""
+    if os.name != 'nt':
+        return
+    
+    kernel32 = ctypes.windll.kernel32
+    handle = kernel32.GetStdHandle(-11)  # STD_OUTPUT_HANDLE
+    mode = ctypes.c_uint32()
+    if kernel32.GetConsoleMode(handle, ctypes.byref(mode)):
+        kernel32.SetConsoleMode(handle, mode.value | 0x0004)  # ENABLE_VIRTUAL_TERMINAL_PROCESSING
+
+
 def main():
     parser = argparse.ArgumentParser(
         description='Play videos in terminal as ASCII art',
@@ -139,6 +340,12 @@ Examples:
                         help='Use detailed ASCII character set')
     parser.add_argument('-s', '--start', type=int, default=0,
                         help='Start from frame number (default: 0)')
+    parser.add_argument('-i', '--interp', choices=sorted(INTERPOLATIONS), default='nearest',
+                        help='Resize interpolation (default: nearest, area is smoother)')
+    parser.add_argument('--cuda', action='store_true',
+                        help='Convert 1080p+ frames on the GPU (needs OpenCV built with CUDA)')
+    parser.add_argument('-t', '--threads', type=int, default=os.environ.get('ASCII_CV_THREADS', '2'),
+                        help='OpenCV worker threads (default: $ASCII_CV_THREADS or 2)')
     
     args = parser.parse_args()
     
@@ -147,9 +354,15 @@ Examples:
         print(f"Error: File not found: {args.video}")
         sys.exit(1)
     
+    # Small frames don't benefit from OpenCV using every core
+    cv2.setNumThreads(args.threads)
+    
+    enable_ansi()
+    
     # Create player and play
     try:
-        player = ASCIIVideoPlayer(args.video, width=args.width, detailed=args.detailed)
+        player = ASCIIVideoPlayer(args.video, width=args.width, detailed=args.detailed,
+                                  interpolation=args.interp, cuda=args.cuda)
         player.play(start_frame=args.start)
     except Exception as e:
         print(f"Error: {e}")
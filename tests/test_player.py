@@ -0,0 +1,103 @@
+"""
+Playback pacing tests for the terminal ASCII video player
+Covers both player.py and the copy embedded in install_ascii_player.py
+"""
+
+import importlib.util
+import os
+import re
+import sys
+import time
+import types
+
+import cv2
+import numpy as np
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import player
+import install_ascii_player
+
+FRAMES = 90
+FPS = 30
+
+
+@pytest.fixture(scope='module')
+def video(tmp_path_factory):
+    """Small 90-frame, 30 FPS clip with a moving gradient"""
+    path = str(tmp_path_factory.mktemp('video') / 'clip.avi')
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*'MJPG'), FPS, (160, 120))
+    for i in range(FRAMES):
+        frame = np.zeros((120, 160, 3), dtype=np.uint8)
+        frame[:] = ((np.arange(160) + i * 5) % 256)[None, :, None]
+        writer.write(frame)
+    writer.release()
+    return path
+
+
+@pytest.fixture(scope='module', params=['player', 'installed'])
+def module(request, tmp_path_factory):
+    """The player module, either from the repo or as written by the installer"""
+    if request.param == 'player':
+        return player
+
+    path = tmp_path_factory.mktemp('installed') / 'ascii_player.py'
+    path.write_text(install_ascii_player.PLAYER_CODE, encoding='utf-8')
+    spec = importlib.util.spec_from_file_location('ascii_player', path)
+    mod = importlib.util.module_from_spec(spec)
+    sys.modules['ascii_player'] = mod
+    spec.loader.exec_module(mod)
+    return mod
+
+
+class SlowCapture:
+    """VideoCapture wrapper whose grab() takes a fixed time, like slow hardware"""
+    def __init__(self, cap, grab_delay):
+        self.cap = cap
+        self.grab_delay = grab_delay
+
+    def __getattr__(self, name):
+        return getattr(self.cap, name)
+
+    def grab(self):
+        time.sleep(self.grab_delay)
+        return self.cap.grab()
+
+
+class FrameRecorder:
+    """Stands in for stdout and records which frame numbers were shown"""
+    def __init__(self):
+        self.shown = []
+
+    def write(self, data):
+        match = re.search(rb'Frame: (\d+)/', bytes(data))
+        if match:
+            self.shown.append(int(match.group(1)))
+
+    def flush(self):
+        pass
+
+
+@pytest.mark.parametrize('grab_delay', [0.040, 0.060])
+def test_slow_decode_keeps_rendering(module, video, grab_delay, monkeypatch):
+    # Skip the 2 second banner pause, keep real sleeps for frame pacing
+    fake_time = types.SimpleNamespace(
+        monotonic_ns=time.monotonic_ns,
+        sleep=lambda s: None if s >= 1 else time.sleep(s),
+    )
+    monkeypatch.setattr(module, 'time', fake_time)
+
+    p = module.ASCIIVideoPlayer(video, width=40)
+    p.cap = SlowCapture(p.cap, grab_delay)
+    recorder = FrameRecorder()
+    p._stdout = recorder
+    p.play()
+
+    shown = recorder.shown
+    assert shown == sorted(shown)
+    # Frames keep being shown right up to the end of the video
+    assert shown[-1] >= FRAMES - 6
+    gaps = np.diff([0] + shown)
+    assert gaps.max() <= 6